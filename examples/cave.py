@@ -4,11 +4,12 @@ Example puzzle can be found at
 https://www.gmpuzzles.com/blog/cave-rules-and-info/.
 """
 
-from z3 import Implies
+from z3 import Implies, Not
 
 import grilops
 import grilops.regions
 import grilops.sightlines
+from grilops.geometry import Point
 
 
 SYM = grilops.SymbolSet([("B", chr(0x2588)), ("W", " ")])
@@ -33,39 +34,53 @@ def main():
   sg = grilops.SymbolGrid(lattice, SYM)
   rc = grilops.regions.RegionConstrainer(lattice, solver=sg.solver)
 
+  given_at = {
+      p: GIVENS[p.y][p.x] for p in lattice.points if GIVENS[p.y][p.x] != 0
+  }
+
   # The cave must be a single connected group. Force the root of this region to
   # be the top-most, left-most given.
-  cave_root_point = next(p for p in lattice.points if GIVENS[p.y][p.x] != 0)
+  cave_root_point = next(iter(given_at))
   cave_region_id = lattice.point_to_index(cave_root_point)
   sg.solver.add(rc.parent_grid[cave_root_point] == grilops.regions.R)
 
+  # There are only two symbols, so a cell is shaded exactly when it is not
+  # white; reuse one expression for both.
+  is_white = {p: sg.cell_is(p, SYM.W) for p in lattice.points}
+
+  # Sightlines from a given cell stop at the first shaded cell.
+  def is_shaded(c):
+    return Not(c == SYM.W)
+
   for p in lattice.points:
     # Ensure that every cave cell has the same region ID.
     sg.solver.add(
-        sg.cell_is(p, SYM.W) ==
+        is_white[p] ==
         (rc.region_id_grid[p] == cave_region_id)
     )
 
-    # Every shaded region must connect to an edge of the grid. We'll enforce
-    # this by requiring that the root of a shaded region is along the edge of
-    # the grid.
-    if 0 < p.y < HEIGHT - 1 and 0 < p.x < WIDTH - 1:
-      sg.solver.add(
-          Implies(
-              sg.cell_is(p, SYM.B),
-              rc.parent_grid[p] != grilops.regions.R
-          )
-      )
-
-    if GIVENS[p.y][p.x] != 0:
-      sg.solver.add(sg.cell_is(p, SYM.W))
+    if p in given_at:
+      sg.solver.add(is_white[p])
       # Count the cells visible along sightlines from the given cell.
       visible_cell_count = 1 + sum(
           grilops.sightlines.count_cells(
-              sg, n.location, n.direction, stop=lambda c: c == SYM.B
+              sg, n.location, n.direction, stop=is_shaded
           ) for n in sg.edge_sharing_neighbors(p)
       )
-      sg.solver.add(visible_cell_count == GIVENS[p.y][p.x])
+      sg.solver.add(visible_cell_count == given_at[p])
+
+  # Every shaded region must connect to an edge of the grid. We'll enforce
+  # this by requiring that the root of a shaded region is along the edge of
+  # the grid.
+  for y in range(1, HEIGHT - 1):
+    for x in range(1, WIDTH - 1):
+      p = Point(y, x)
+      sg.solver.add(
+          Implies(
+              Not(is_white[p]),
+              rc.parent_grid[p] != grilops.regions.R
+          )
+      )
 
   def print_grid():
     sg.print(lambda p, _: str(GIVENS[p.y][p.x]) if GIVENS[p.y][p.x] != 0 else None)
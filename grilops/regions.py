@@ -7,9 +7,10 @@ in its subtree are exposed by properties of the `RegionConstrainer`.
 
 import itertools
 
-from typing import Dict, Optional
-from z3 import And, ArithRef, If, Implies, Int, Or, Solver, Sum
+from typing import Dict, List, Optional, Tuple
+from z3 import And, ArithRef, If, Implies, Int, IntVal, Or, Solver, Sum
 
+from .fastz3 import fast_and, fast_eq, fast_ne
 from .geometry import Direction, Lattice, Point
 
 
@@ -65,6 +66,7 @@ class RegionConstrainer:  # pylint: disable=R0902
     else:
       self.__max_region_size = len(self.__lattice.points)
     self.__manage_edge_sharing_directions()
+    self.__manage_adjacencies()
     self.__create_grids()
     self.__add_constraints()
     if rectangular:
@@ -74,50 +76,82 @@ class RegionConstrainer:  # pylint: disable=R0902
     """Creates the structures used for managing edge-sharing directions.
 
     Creates the mapping between edge-sharing directions and the parent
-    indices corresponding to them.
+    indices corresponding to them, and a list of each direction paired with
+    its own parent index and the parent index of its opposite direction.
     """
     self.__edge_sharing_direction_to_index = {}
     self.__parent_type_to_index = {"X": X, "R": R}
     self.__parent_types = ["X", "R"]
-    for d in self.__lattice.edge_sharing_directions():
+    directions = self.__lattice.edge_sharing_directions()
+    for d in directions:
       index = len(self.__parent_types)
       self.__parent_type_to_index[d.name] = index
       self.__edge_sharing_direction_to_index[d] = index
       self.__parent_types.append(d.name)
+    self.__edge_sharing_direction_indices: List[Tuple[Direction, int, int]] = [
+        (
+            d,
+            self.__edge_sharing_direction_to_index[d],
+            self.__edge_sharing_direction_to_index[
+                self.__lattice.opposite_direction(d)],
+        )
+        for d in directions
+    ]
+
+  def __manage_adjacencies(self):
+    """Creates the table of edge-sharing adjacencies of each point.
+
+    The table is a list parallel to the lattice's points. For each point and
+    each edge-sharing direction, it records the position of the neighboring
+    point in that direction (or None if it is not part of the lattice), the
+    parent index for that direction, and the parent index that the neighbor
+    would use to point back at the point.
+    """
+    point_positions = {p: i for i, p in enumerate(self.__lattice.points)}
+    self.__adjacencies: List[List[Tuple[Optional[int], int, int]]] = []
+    for p in self.__lattice.points:
+      self.__adjacencies.append([
+          (point_positions.get(p.translate(d.vector)), d_index, opposite_index)
+          for d, d_index, opposite_index in self.__edge_sharing_direction_indices
+      ])
 
   def __create_grids(self):
     """Create the grids used to model region constraints."""
+    num_parent_types = len(self.__parent_types)
+    num_points = len(self.__lattice.points)
+    asserts = []
+
     self.__parent_grid: Dict[Point, ArithRef] = {}
     for p in self.__lattice.points:
       v = Int(f"rcp-{RegionConstrainer._instance_index}-{p.y}-{p.x}")
       if self.__complete:
-        self.__solver.add(v >= R)
+        asserts.append(v >= R)
       else:
-        self.__solver.add(v >= X)
-      self.__solver.add(v < len(self.__parent_types))
+        asserts.append(v >= X)
+      asserts.append(v < num_parent_types)
       self.__parent_grid[p] = v
 
     self.__subtree_size_grid: Dict[Point, ArithRef] = {}
     for p in self.__lattice.points:
       v = Int(f"rcss-{RegionConstrainer._instance_index}-{p.y}-{p.x}")
       if self.__complete:
-        self.__solver.add(v >= 1)
+        asserts.append(v >= 1)
       else:
-        self.__solver.add(v >= 0)
-      self.__solver.add(v <= self.__max_region_size)
+        asserts.append(v >= 0)
+      asserts.append(v <= self.__max_region_size)
       self.__subtree_size_grid[p] = v
 
     self.__region_id_grid: Dict[Point, ArithRef] = {}
     for p in self.__lattice.points:
       v = Int(f"rcid-{RegionConstrainer._instance_index}-{p.y}-{p.x}")
       if self.__complete:
-        self.__solver.add(v >= 0)
+        asserts.append(v >= 0)
       else:
-        self.__solver.add(v >= -1)
-      self.__solver.add(v < len(self.__lattice.points))
+        asserts.append(v >= -1)
+      asserts.append(v < num_points)
       parent = self.__parent_grid[p]
-      self.__solver.add(Implies(parent == X, v == -1))
-      self.__solver.add(Implies(
+      asserts.append(Implies(parent == X, v == -1))
+      asserts.append(Implies(
           parent == R,
           v == self.__lattice.point_to_index(p)
       ))
@@ -127,77 +161,87 @@ class RegionConstrainer:  # pylint: disable=R0902
     for p in self.__lattice.points:
       v = Int(f"rcrs-{RegionConstrainer._instance_index}-{p.y}-{p.x}")
       if self.__complete:
-        self.__solver.add(v >= self.__min_region_size)
+        asserts.append(v >= self.__min_region_size)
       else:
-        self.__solver.add(Or(v >= self.__min_region_size, v == -1))
-      self.__solver.add(v <= self.__max_region_size)
+        asserts.append(Or(v >= self.__min_region_size, v == -1))
+      asserts.append(v <= self.__max_region_size)
       parent = self.__parent_grid[p]
       subtree_size = self.__subtree_size_grid[p]
-      self.__solver.add(Implies(parent == X, v == -1))
-      self.__solver.add(Implies(parent == R, v == subtree_size))
+      asserts.append(Implies(parent == X, v == -1))
+      asserts.append(Implies(parent == R, v == subtree_size))
       self.__region_size_grid[p] = v
 
+    self.__solver.add(*asserts)
+
+  def __grid_by_position(self, grid: Dict[Point, ArithRef]) -> List[ArithRef]:
+    """Returns a grid's cells as a list parallel to the lattice's points."""
+    return [grid[p] for p in self.__lattice.points]
+
   def __add_constraints(self):
     """Add constraints to the region modeling grids."""
-    def constrain_side(p, sp, sd):
-      self.__solver.add(Implies(
-          self.__parent_grid[p] == X,
-          self.__parent_grid[sp] != sd
+    int_vals = [IntVal(i) for i in range(len(self.__parent_types))]
+
+    # Index the grids by position in the lattice's points, matching the
+    # adjacency table, to avoid hashing points in the loops below.
+    parent_grid = self.__grid_by_position(self.__parent_grid)
+    subtree_size_grid = self.__grid_by_position(self.__subtree_size_grid)
+    region_id_grid = self.__grid_by_position(self.__region_id_grid)
+    region_size_grid = self.__grid_by_position(self.__region_size_grid)
+    asserts = []
+
+    def constrain_side(i, si, sd):
+      asserts.append(Implies(
+          fast_eq(parent_grid[i], int_vals[X]),
+          fast_ne(parent_grid[si], int_vals[sd])
       ))
-      self.__solver.add(Implies(
-          self.__parent_grid[sp] == sd,
-          And(
-              self.__region_id_grid[p] == self.__region_id_grid[sp],
-              self.__region_size_grid[p] == self.__region_size_grid[sp],
+      asserts.append(Implies(
+          fast_eq(parent_grid[si], int_vals[sd]),
+          fast_and(
+              fast_eq(region_id_grid[i], region_id_grid[si]),
+              fast_eq(region_size_grid[i], region_size_grid[si]),
           )
       ))
 
-    def subtree_size_term(sp, sd):
-      return If(
-          self.__parent_grid[sp] == sd,
-          self.__subtree_size_grid[sp],
-          0
-      )
-
-    for p in self.__lattice.points:
-      parent = self.__parent_grid[p]
-      subtree_size_terms = [If(parent != X, 1, 0)]
-
-      for d in self.__lattice.edge_sharing_directions():
-        sp = p.translate(d.vector)
-        if sp in self.__parent_grid:
-          opposite_index = self.__edge_sharing_direction_to_index[
-              self.__lattice.opposite_direction(d)]
-          constrain_side(p, sp, opposite_index)
-          subtree_size_terms.append(subtree_size_term(sp, opposite_index))
+    for i, adjacencies in enumerate(self.__adjacencies):
+      parent = parent_grid[i]
+      subtree_size_terms = [If(fast_ne(parent, int_vals[X]), 1, 0)]
+
+      for si, d_index, opposite_index in adjacencies:
+        if si is not None:
+          constrain_side(i, si, opposite_index)
+          subtree_size_terms.append(If(
+              fast_eq(parent_grid[si], int_vals[opposite_index]),
+              subtree_size_grid[si],
+              0
+          ))
         else:
-          d_index = self.__edge_sharing_direction_to_index[d]
-          self.__solver.add(parent != d_index)
+          asserts.append(fast_ne(parent, int_vals[d_index]))
 
-      self.__solver.add(
-          self.__subtree_size_grid[p] == Sum(*subtree_size_terms)
+      asserts.append(
+          fast_eq(subtree_size_grid[i], Sum(*subtree_size_terms))
       )
 
+    self.__solver.add(*asserts)
+
   def __add_rectangular_constraints(self):
-    for p in self.__lattice.points:
-      neighbors = self.__lattice.edge_sharing_neighbors(
-          self.__region_id_grid, p)
-      for n1, n2 in itertools.combinations(neighbors, 2):
-        n1_neighbors = self.__lattice.edge_sharing_neighbors(
-            self.__region_id_grid, n1.location)
-        n2_neighbors = self.__lattice.edge_sharing_neighbors(
-            self.__region_id_grid, n2.location)
+    points = self.__lattice.points
+    neighbor_points = {
+        points[i]: [points[si] for si, _, _ in adjacencies if si is not None]
+        for i, adjacencies in enumerate(self.__adjacencies)
+    }
+    for p in points:
+      for n1, n2 in itertools.combinations(neighbor_points[p], 2):
         common_points = (
-            set(n.location for n in n1_neighbors) &
-            set(n.location for n in n2_neighbors) -
+            set(neighbor_points[n1]) &
+            set(neighbor_points[n2]) -
             {p}
         )
         if common_points:
           self.__solver.add(
               Implies(
                   And(
-                      n1.symbol == self.__region_id_grid[p],
-                      n2.symbol == self.__region_id_grid[p]
+                      self.__region_id_grid[n1] == self.__region_id_grid[p],
+                      self.__region_id_grid[n2] == self.__region_id_grid[p]
                   ),
                   And(*[
                       self.__region_id_grid[cp] == self.__region_id_grid[p]
@@ -286,12 +330,10 @@ class RegionConstrainer:  # pylint: disable=R0902
         "SW": chr(0x2B69),
     }
 
-    model = self.__solver.model()
+    parent_indices = self.__solved_values(self.__parent_grid)
 
     def print_function(p):
-      v = self.__parent_grid[p]
-      parent_index = model.eval(v).as_long()
-      parent_type = self.__parent_types[parent_index]
+      parent_type = self.__parent_types[parent_indices[p]]
       return labels[parent_type]
 
     self.__lattice.print(print_function, " ")
@@ -301,36 +343,28 @@ class RegionConstrainer:  # pylint: disable=R0902
 
     Should be called only after the solver has been checked.
     """
-    model = self.__solver.model()
-    def print_function(p):
-      v = self.__subtree_size_grid[p]
-      value = model.eval(v).as_long()
-      return f"{value:3}"
-
-    self.__lattice.print(print_function, "   ")
+    self.__print_values(self.__subtree_size_grid)
 
   def print_region_ids(self):
     """Prints a number identifying the region that owns each cell.
 
     Should be called only after the solver has been checked.
     """
-    model = self.__solver.model()
-    def print_function(p):
-      v = self.__region_id_grid[p]
-      value = model.eval(v).as_long()
-      return f"{value:3}"
-
-    self.__lattice.print(print_function, "   ")
+    self.__print_values(self.__region_id_grid)
 
   def print_region_sizes(self):
     """Prints the size of the region that contains each cell.
 
     Should be called only after the solver has been checked.
     """
+    self.__print_values(self.__region_size_grid)
+
+  def __solved_values(self, grid: Dict[Point, ArithRef]) -> Dict[Point, int]:
+    """Evaluates every cell of a region modeling grid against one model."""
     model = self.__solver.model()
-    def print_function(p):
-      v = self.__region_size_grid[p]
-      value = model.eval(v).as_long()
-      return f"{value:3}"
+    return {p: model.eval(v).as_long() for p, v in grid.items()}
 
-    self.__lattice.print(print_function, "   ")
+  def __print_values(self, grid: Dict[Point, ArithRef]):
+    """Prints the solved value of each cell of a region modeling grid."""
+    values = self.__solved_values(grid)
+    self.__lattice.print(lambda p: f"{values[p]:3}", "   ")